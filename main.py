@@ -6,13 +6,10 @@ import logging
 import time
 
 
-def main():
-    load_dotenv()
-    config = load_config()
-
+def run_worker(config, poll_interval=5, keep_running=lambda: True):
     logger = logging.getLogger(__name__)
 
-    while True:
+    while keep_running():
         try:
             if config.sqs_enabled:
                 process_sqs_message(config.sqs_client, config.queue_url)
@@ -20,8 +17,14 @@ def main():
                 process_webhook_message()
         except Exception as e:
             logger.error(f"Error in main loop: {str(e)}")
-        logger.info("Sleeping for 5 seconds...")
-        time.sleep(5)
+        logger.info(f"Sleeping for {poll_interval} seconds...")
+        time.sleep(poll_interval)
+
+
+def main():
+    load_dotenv()
+    config = load_config()
+    run_worker(config)
 
 
 if __name__ == "__main__":
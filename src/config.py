@@ -25,6 +25,24 @@ class Config:
         self.webhook_url = os.getenv("WEBHOOK_URL")
         self.webhook_token = os.getenv("WEBHOOK_TOKEN")
 
+        self.dedup_enabled = os.getenv("ENABLE_DEDUP", "false").lower() == "true"
+        self.dedup_index_prefix = os.getenv("DEDUP_INDEX_PREFIX", "dedup-index")
+        self.dedup_ttl_days = int(os.getenv("DEDUP_TTL_DAYS", "30"))
+
+        self.codec_tier_enabled = (
+            os.getenv("ENABLE_CODEC_TIER", "false").lower() == "true"
+        )
+        self.codec_tier_codecs = [
+            codec.strip().lower()
+            for codec in os.getenv("CODEC_TIER_CODECS", "hevc").split(",")
+            if codec.strip()
+        ]
+        self.codec_tier_top_rungs = int(os.getenv("CODEC_TIER_TOP_RUNGS", "2"))
+        self.codec_tier_min_duration = float(
+            os.getenv("CODEC_TIER_MIN_DURATION", "600")
+        )
+        self.codec_tier_min_views = int(os.getenv("CODEC_TIER_MIN_VIEWS", "0"))
+
         if self.sqs_enabled:
             self.sqs_client = self._create_sqs_client()
             self.queue_url = self.aws_sqs_url
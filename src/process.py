@@ -1,5 +1,10 @@
 import time
 from venv import logger
+from src.s3_operations.dedup import (
+    fingerprint_raw_object,
+    record_processed_output,
+    reuse_processed_output,
+)
 from src.s3_operations.download import delete_file_from_s3, download_from_s3
 from botocore.exceptions import ClientError
 import requests
@@ -32,7 +37,7 @@ def process_webhook_message():
         if "id" in data:
             video_id = data["id"]
             try:
-                process_video(video_id)
+                process_video(video_id, parse_expected_views(data.get("expectedViews")))
                 pass
             except Exception as e:
                 logger.error(f"Error processing video: {str(e)}")
@@ -43,18 +48,39 @@ def process_webhook_message():
         logger.error(f"Failed to get next video from webhook: {str(e)}")
 
 
-def process_video(file_name):
+def parse_expected_views(value):
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring invalid expectedViews value: {value!r}")
+        return None
+
+
+def process_video(file_name, expected_views=None):
     try:
         setup(file_name)
         raw_file_path = f"./upload/{file_name}/{file_name}"
 
+        fingerprint = None
+        if config.dedup_enabled:
+            fingerprint = fingerprint_raw_object(f"uploads/{file_name}")
+            if fingerprint and reuse_processed_output(fingerprint, file_name):
+                send_webhook(file_name, "DONE")
+                delete_file_from_s3(f"uploads/{file_name}")
+                logger.info(f"File '{file_name}' deleted from main account.")
+                return
+
         download_from_s3(f"uploads/{file_name}", f"./upload/{file_name}/{file_name}")
 
         if not is_video_file_fine(raw_file_path):
             raise ValueError(f"Broken video: {file_name}")
 
         start = time.time()
-        create_adaptive_hls(raw_file_path, f"./upload/{file_name}")
+        create_adaptive_hls(
+            raw_file_path, f"./upload/{file_name}", expected_views=expected_views
+        )
         logger.info("Adaptive Stream complete")
         log_time_taken(start)
 
@@ -63,6 +89,9 @@ def process_video(file_name):
         logger.info("Upload complete")
         log_time_taken(start)
 
+        if fingerprint:
+            record_processed_output(fingerprint, file_name, f"./upload/{file_name}")
+
         send_webhook(file_name, "DONE")
 
         delete_file_from_s3(f"uploads/{file_name}")
@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import os
+import time
+from botocore.exceptions import ClientError
+from src.logging_config import logger
+from src.config import load_config
+from src.s3_operations import download, upload
+
+config = load_config()
+
+SAMPLE_SIZE = 64 * 1024
+
+
+def fingerprint_raw_object(file_name):
+    # ETag + size + head/middle/tail samples, so we never download the whole file
+    s3_client = download.create_s3_client()
+    try:
+        head = s3_client.head_object(Bucket=config.s3_rawfiles_bucket, Key=file_name)
+        size = head["ContentLength"]
+        digest = hashlib.sha256(f"{head.get('ETag', '')}:{size}".encode())
+        for offset in _sample_offsets(size):
+            end = min(offset + SAMPLE_SIZE, size) - 1
+            response = s3_client.get_object(
+                Bucket=config.s3_rawfiles_bucket,
+                Key=file_name,
+                Range=f"bytes={offset}-{end}",
+            )
+            digest.update(response["Body"].read())
+        return digest.hexdigest()
+    except Exception as e:
+        logger.warning(f"Failed to fingerprint {file_name}, skipping dedup: {str(e)}")
+        return None
+
+
+def reuse_processed_output(fingerprint, file_name):
+    s3_client = upload.create_s3_client()
+    try:
+        entry = _read_index_entry(s3_client, fingerprint)
+        if entry is None:
+            return False
+
+        if time.time() - entry["last_used_at"] > config.dedup_ttl_days * 86400:
+            logger.info(f"Dedup entry {fingerprint} expired, evicting.")
+            _delete_index_entry(s3_client, fingerprint)
+            return False
+
+        source = entry["prefix"]
+        if not _is_output_complete(s3_client, source, entry["manifest"]):
+            logger.warning(
+                f"Dedup entry {fingerprint} points at incomplete output '{source}', evicting."
+            )
+            _delete_index_entry(s3_client, fingerprint)
+            return False
+
+        if source != file_name:
+            _copy_output(s3_client, source, file_name, entry["manifest"])
+            # Point at the newest copy so deleting the original doesn't orphan it
+            entry["prefix"] = file_name
+            entry["manifest"] = [
+                _target_path(relative_path, source, file_name)
+                for relative_path in entry["manifest"]
+            ]
+
+        entry["last_used_at"] = time.time()
+        _write_index_entry(s3_client, fingerprint, entry)
+        logger.info(f"Reused processed output of '{source}' for '{file_name}'.")
+        return True
+    except Exception as e:
+        logger.warning(f"Dedup lookup failed for {file_name}, transcoding: {str(e)}")
+        return False
+
+
+def record_processed_output(fingerprint, file_name, folder_path):
+    s3_client = upload.create_s3_client()
+    manifest = []
+    for root, dirs, files in os.walk(folder_path):
+        for file in files:
+            manifest.append(os.path.relpath(os.path.join(root, file), folder_path))
+
+    entry = {"prefix": file_name, "manifest": manifest, "last_used_at": time.time()}
+    try:
+        _write_index_entry(s3_client, fingerprint, entry)
+        logger.info(f"Recorded dedup entry {fingerprint} for '{file_name}'.")
+    except Exception as e:
+        logger.warning(f"Failed to record dedup entry for {file_name}: {str(e)}")
+
+
+def sweep_expired_entries():
+    # Entries are rewritten on every hit, so LastModified is the last use
+    s3_client = upload.create_s3_client()
+    cutoff = time.time() - config.dedup_ttl_days * 86400
+    evicted = 0
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(
+        Bucket=config.s3_processed_bucket, Prefix=f"{config.dedup_index_prefix}/"
+    ):
+        for obj in page.get("Contents", []):
+            if obj["LastModified"].timestamp() < cutoff:
+                s3_client.delete_object(Bucket=config.s3_processed_bucket, Key=obj["Key"])
+                evicted += 1
+    logger.info(f"Evicted {evicted} expired dedup entries.")
+    return evicted
+
+
+def _sample_offsets(size):
+    if size <= 3 * SAMPLE_SIZE:
+        return [0] if size else []
+    return [0, (size - SAMPLE_SIZE) // 2, size - SAMPLE_SIZE]
+
+
+def _index_key(fingerprint):
+    return f"{config.dedup_index_prefix}/{fingerprint}.json"
+
+
+def _read_index_entry(s3_client, fingerprint):
+    try:
+        response = s3_client.get_object(
+            Bucket=config.s3_processed_bucket, Key=_index_key(fingerprint)
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("NoSuchKey", "404"):
+            return None
+        raise
+    return json.loads(response["Body"].read())
+
+
+def _write_index_entry(s3_client, fingerprint, entry):
+    s3_client.put_object(
+        Bucket=config.s3_processed_bucket,
+        Key=_index_key(fingerprint),
+        Body=json.dumps(entry).encode(),
+        ContentType="application/json",
+    )
+
+
+def _delete_index_entry(s3_client, fingerprint):
+    s3_client.delete_object(
+        Bucket=config.s3_processed_bucket, Key=_index_key(fingerprint)
+    )
+
+
+def _is_output_complete(s3_client, prefix, manifest):
+    existing = set()
+    paginator = s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=config.s3_processed_bucket, Prefix=f"{prefix}/"):
+        for obj in page.get("Contents", []):
+            existing.add(obj["Key"])
+    return all(f"{prefix}/{relative_path}" in existing for relative_path in manifest)
+
+
+def _copy_output(s3_client, source, target, manifest):
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = []
+        for relative_path in manifest:
+            future = executor.submit(
+                s3_client.copy,
+                {"Bucket": config.s3_processed_bucket, "Key": f"{source}/{relative_path}"},
+                config.s3_processed_bucket,
+                f"{target}/{_target_path(relative_path, source, target)}",
+            )
+            futures.append(future)
+
+        for future in futures:
+            future.result()
+
+
+def _target_path(relative_path, source, target):
+    # The raw upload is stored under its own id, rename it with the folder
+    return target if relative_path == source else relative_path
+
+
+if __name__ == "__main__":
+    sweep_expired_entries()
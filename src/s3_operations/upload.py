@@ -15,8 +15,8 @@ def upload_to_s3(local_path, relative_path, s3_client):
         raise
 
 
-def upload_everything():
-    s3_client = boto3.client(
+def create_s3_client():
+    return boto3.client(
         "s3",
         aws_access_key_id=config.s3_processed_access_key_id,
         aws_secret_access_key=config.s3_processed_secret_access_key,
@@ -24,6 +24,10 @@ def upload_everything():
         region_name=config.s3_processed_region,
     )
 
+
+def upload_everything():
+    s3_client = create_s3_client()
+
     with ThreadPoolExecutor(max_workers=10) as executor:
         futures = []
         for root, dirs, files in os.walk("./upload"):
@@ -0,0 +1,3 @@
+from .runner import run_simulation
+
+__all__ = ["run_simulation"]
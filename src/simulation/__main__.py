@@ -0,0 +1,49 @@
+import argparse
+import json
+import logging
+from src.simulation.runner import format_report, run_simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive the worker loop with a fake encoder and local stand-ins."
+    )
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--mode", choices=["webhook", "sqs"], default="webhook")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--duration", type=float, default=300, help="seconds")
+    parser.add_argument("--source-size", type=int, default=200_000_000, help="bytes")
+    parser.add_argument("--encode-latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--sprite-latency", type=float, default=0.01, help="seconds")
+    parser.add_argument("--request-latency", type=float, default=0.002, help="seconds")
+    parser.add_argument(
+        "--bandwidth", type=float, default=1_000_000_000, help="bytes per second, shared by all concurrent transfers"
+    )
+    parser.add_argument("--jitter", type=float, default=0.25, help="lognormal sigma")
+    parser.add_argument("--poll-interval", type=float, default=0, help="seconds")
+    parser.add_argument("--visibility-timeout", type=float, default=30, help="seconds")
+    parser.add_argument(
+        "--wait-scale",
+        type=float,
+        default=0.01,
+        help="scale applied to the SQS long-poll wait",
+    )
+    parser.add_argument("--timeout", type=float, default=3600, help="seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the raw report")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    options = vars(args)
+    as_json = options.pop("json")
+    options.pop("verbose")
+    report = run_simulation(**options)
+    print(json.dumps(report, indent=2) if as_json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
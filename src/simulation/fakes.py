@@ -0,0 +1,158 @@
+import math
+import os
+import threading
+import time
+from decimal import Decimal
+from src.video_processing.codec_tier import (
+    generate_codec_tier_variants,
+    should_use_codec_tier,
+)
+from src.video_processing.hls_generator import (
+    create_master_playlist,
+    generate_hls_variants,
+    measure_bandwidth,
+)
+from src.video_processing.sprite_generator import create_webvtt_file
+
+SEGMENT_SECONDS = 6
+
+# Typical artifact sizes produced by the sprite/gif generator
+SPRITE_ARTIFACTS = {
+    "sprite.jpg": 450_000,
+    "short.gif": 900_000,
+    "long.gif": 6_000_000,
+    "poster.jpg": 25_000,
+}
+
+
+class Latency:
+    def __init__(self, seconds, jitter, rng):
+        self.seconds = seconds
+        self.jitter = jitter
+        self.rng = rng
+        self._lock = threading.Lock()
+
+    def sample(self):
+        if self.seconds <= 0:
+            return 0
+        with self._lock:
+            return self.seconds * self.rng.lognormvariate(0, self.jitter)
+
+    def sleep(self):
+        time.sleep(self.sample())
+
+
+def write_sparse_file(path, size):
+    # Realistic sizes for the upload walk without actually writing the bytes
+    with open(path, "wb") as f:
+        f.truncate(size)
+
+
+class FakeEncoder:
+    def __init__(self, width, height, duration, encode_latency, sprite_latency):
+        self.width = width
+        self.height = height
+        self.duration = duration
+        self.encode_latency = encode_latency
+        self.sprite_latency = sprite_latency
+
+    def create_adaptive_hls(self, input_file, output_folder, expected_views=None):
+        self.encode_latency.sleep()
+
+        hls_variants = generate_hls_variants(
+            self.width, self.height, os.path.dirname(input_file), self.duration
+        )
+        if should_use_codec_tier(self.duration, expected_views):
+            hls_variants += generate_codec_tier_variants(hls_variants)
+        for variant in hls_variants:
+            self._write_variant(output_folder, variant)
+            variant["bandwidth"], variant["average_bandwidth"] = measure_bandwidth(
+                f"{output_folder}/{variant['playlist_name']}"
+            )
+
+        create_master_playlist(output_folder, hls_variants)
+        self.generate_sprite_and_vtt(input_file, output_folder)
+
+        return self.duration
+
+    def generate_sprite_and_vtt(self, input_file, output_dir):
+        self.sprite_latency.sleep()
+
+        num_frames = 100
+        create_webvtt_file(
+            output_dir, num_frames, Decimal(self.duration) / num_frames, 384, 216
+        )
+        for name, size in SPRITE_ARTIFACTS.items():
+            write_sparse_file(os.path.join(output_dir, name), size)
+
+    def _write_variant(self, output_folder, variant):
+        variant_folder = f"{output_folder}/{variant['playlist_name']}"
+        os.makedirs(variant_folder, exist_ok=True)
+
+        total_kbps = int(variant["video_bitrate"][:-1]) + int(
+            variant["audio_bitrate"][:-1]
+        )
+        segment_count = math.ceil(self.duration / SEGMENT_SECONDS)
+        fmp4 = variant["codec"] != "h264"
+        extension = "m4s" if fmp4 else "ts"
+
+        with open(f"{variant_folder}/stream.m3u8", "w") as playlist:
+            playlist.write(f"#EXTM3U\n#EXT-X-VERSION:{7 if fmp4 else 3}\n")
+            playlist.write(f"#EXT-X-TARGETDURATION:{SEGMENT_SECONDS}\n")
+            playlist.write("#EXT-X-PLAYLIST-TYPE:VOD\n")
+            if fmp4:
+                write_sparse_file(f"{variant_folder}/init.mp4", 1_000)
+                playlist.write('#EXT-X-MAP:URI="init.mp4"\n')
+            for i in range(segment_count):
+                seconds = min(SEGMENT_SECONDS, self.duration - i * SEGMENT_SECONDS)
+                write_sparse_file(
+                    f"{variant_folder}/{i:03d}.{extension}",
+                    int(total_kbps * 125 * seconds),
+                )
+                playlist.write(f"#EXTINF:{seconds:.6f},\n{i:03d}.{extension}\n")
+            playlist.write("#EXT-X-ENDLIST\n")
+
+
+class FakeTransfers:
+    def __init__(self, source_size, request_latency, bandwidth):
+        self.source_size = source_size
+        self.request_latency = request_latency
+        self.bandwidth = bandwidth
+        self.uploaded_files = 0
+        self.uploaded_bytes = 0
+        self._link_free_at = 0.0
+        self._lock = threading.Lock()
+
+    def transfer(self, size):
+        # All transfers share one link: bytes queue behind whatever is in flight
+        latency = self.request_latency.sample()
+        with self._lock:
+            now = time.time()
+            self._link_free_at = max(now, self._link_free_at) + size / self.bandwidth
+            done_at = self._link_free_at
+        time.sleep(latency + done_at - now)
+
+    def download_from_s3(self, file_name, local_path):
+        self.transfer(self.source_size)
+        write_sparse_file(local_path, self.source_size)
+
+    def delete_file_from_s3(self, file_name):
+        self.transfer(0)
+
+    def create_s3_client(self):
+        return FakeS3Client(self)
+
+    def record_upload(self, size):
+        with self._lock:
+            self.uploaded_files += 1
+            self.uploaded_bytes += size
+
+
+class FakeS3Client:
+    def __init__(self, transfers):
+        self.transfers = transfers
+
+    def upload_file(self, local_path, bucket, key):
+        size = os.path.getsize(local_path)
+        self.transfers.transfer(size)
+        self.transfers.record_upload(size)
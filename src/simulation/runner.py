@@ -0,0 +1,226 @@
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from contextlib import ExitStack
+from types import SimpleNamespace
+from unittest import mock
+import main
+import src.process
+import src.sqs_handler
+import src.s3_operations.upload
+import src.webhook
+from src.simulation.fakes import FakeEncoder, FakeTransfers, Latency
+from src.simulation.stand_ins import FakeSQSClient, JobLedger, WebhookServer
+
+QUEUE_URL = "http://sqs.local/simulation"
+WEBHOOK_TOKEN = "simulation-token"
+
+
+class PhaseTimer:
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+        self.total = 0.0
+
+    def __call__(self, *args, **kwargs):
+        start = time.time()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            self.calls += 1
+            self.total += time.time() - start
+
+
+def run_simulation(
+    jobs=1000,
+    mode="webhook",
+    width=1920,
+    height=1080,
+    duration=300,
+    source_size=200_000_000,
+    encode_latency=0.05,
+    sprite_latency=0.01,
+    request_latency=0.002,
+    bandwidth=1_000_000_000,
+    jitter=0.25,
+    poll_interval=0,
+    visibility_timeout=30,
+    wait_scale=0.01,
+    timeout=3600,
+    seed=0,
+):
+    rng = random.Random(seed)
+    ledger = JobLedger()
+    encoder = FakeEncoder(
+        width,
+        height,
+        duration,
+        Latency(encode_latency, jitter, rng),
+        Latency(sprite_latency, jitter, rng),
+    )
+    transfers = FakeTransfers(
+        source_size, Latency(request_latency, jitter, rng), bandwidth
+    )
+    webhook_server = WebhookServer(ledger, WEBHOOK_TOKEN)
+
+    sqs_client = None
+    if mode == "sqs":
+        sqs_client = FakeSQSClient(ledger, visibility_timeout, wait_scale)
+
+    for i in range(jobs):
+        video_id = f"sim-{i:06d}"
+        ledger.enqueued(video_id)
+        if sqs_client:
+            sqs_client.send_message(
+                QueueUrl=QUEUE_URL, MessageBody=_s3_event(f"uploads/{video_id}")
+            )
+        else:
+            webhook_server.add_video(video_id)
+
+    worker_config = SimpleNamespace(
+        sqs_enabled=sqs_client is not None, sqs_client=sqs_client, queue_url=QUEUE_URL
+    )
+    process_video = PhaseTimer(src.process.process_video)
+    deadline = time.time() + timeout
+
+    def keep_running():
+        if time.time() > deadline:
+            return False
+        return not ledger.all_done() or bool(sqs_client and sqs_client.in_flight())
+
+    previous_cwd = os.getcwd()
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as workdir:
+        for module_config in (src.process.config, src.webhook.config):
+            stack.enter_context(
+                mock.patch.object(module_config, "webhook_url", webhook_server.url)
+            )
+            stack.enter_context(
+                mock.patch.object(module_config, "webhook_token", WEBHOOK_TOKEN)
+            )
+        stack.enter_context(
+            mock.patch.object(src.process.config, "dedup_enabled", False)
+        )
+        for target, fake in (
+            ("src.process.create_adaptive_hls", encoder.create_adaptive_hls),
+            ("src.process.download_from_s3", transfers.download_from_s3),
+            ("src.process.delete_file_from_s3", transfers.delete_file_from_s3),
+            ("src.process.is_video_file_fine", lambda input_file: True),
+            ("src.process.process_video", process_video),
+            ("src.sqs_handler.process_video", process_video),
+            (
+                "src.s3_operations.upload.create_s3_client",
+                transfers.create_s3_client,
+            ),
+        ):
+            stack.enter_context(mock.patch(target, fake))
+
+        webhook_server.start()
+        os.chdir(workdir)
+        start = time.time()
+        try:
+            main.run_worker(worker_config, poll_interval, keep_running)
+        finally:
+            elapsed = time.time() - start
+            os.chdir(previous_cwd)
+            webhook_server.stop()
+
+    return _build_report(
+        ledger, webhook_server, sqs_client, transfers, process_video, elapsed
+    )
+
+
+def _s3_event(key):
+    return json.dumps(
+        {
+            "Records": [
+                {"eventName": "ObjectCreated:Put", "s3": {"object": {"key": key}}}
+            ]
+        }
+    )
+
+
+def _percentiles(values):
+    if not values:
+        return {"p50": 0, "p95": 0, "p99": 0, "max": 0}
+    values = sorted(values)
+
+    def rank(p):
+        return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99), "max": values[-1]}
+
+
+def _build_report(ledger, webhook_server, sqs_client, transfers, process_video, elapsed):
+    completed = ledger.completed_at
+    service_times = [
+        completed[video_id] - ledger.dispensed_at[video_id]
+        for video_id in completed
+        if video_id in ledger.dispensed_at
+    ]
+    end_to_end = [
+        completed[video_id] - ledger.enqueued_at[video_id] for video_id in completed
+    ]
+    statuses = list(ledger.statuses.values())
+    poll_overhead = max(elapsed - process_video.total, 0)
+
+    report = {
+        "jobs": len(ledger.enqueued_at),
+        "completed": len(completed),
+        "done": statuses.count("DONE"),
+        "failed": statuses.count("FAILED"),
+        "elapsed": elapsed,
+        "jobs_per_sec": len(completed) / elapsed if elapsed else 0,
+        "service_time": _percentiles(service_times),
+        "end_to_end": _percentiles(end_to_end),
+        "process_video_calls": process_video.calls,
+        "poll_overhead": poll_overhead,
+        "poll_overhead_per_job": poll_overhead / len(completed) if completed else 0,
+        "uploaded_files": transfers.uploaded_files,
+        "uploaded_bytes": transfers.uploaded_bytes,
+    }
+
+    if sqs_client:
+        report["queue"] = {
+            "receives": sqs_client.receives,
+            "empty_receives": sqs_client.empty_receives,
+            "redeliveries": sqs_client.redeliveries,
+            "expired_lease_deletes": sqs_client.expired_lease_deletes,
+            "stale_deletes": sqs_client.stale_deletes,
+            "left_in_queue": sqs_client.in_flight(),
+        }
+    else:
+        report["queue"] = {
+            "polls": webhook_server.polls,
+            "empty_polls": webhook_server.empty_polls,
+        }
+
+    return report
+
+
+def format_report(report):
+    lines = [
+        f"Jobs: {report['completed']}/{report['jobs']} "
+        f"(DONE {report['done']}, FAILED {report['failed']}) "
+        f"in {report['elapsed']:.1f}s -> {report['jobs_per_sec']:.2f} jobs/sec",
+    ]
+    for name in ("service_time", "end_to_end"):
+        p = report[name]
+        lines.append(
+            f"{name}: p50 {p['p50']:.3f}s, p95 {p['p95']:.3f}s, "
+            f"p99 {p['p99']:.3f}s, max {p['max']:.3f}s"
+        )
+    lines.append(
+        f"poll overhead: {report['poll_overhead']:.2f}s total, "
+        f"{report['poll_overhead_per_job'] * 1000:.1f} ms/job"
+    )
+    lines.append(
+        f"uploads: {report['uploaded_files']} files, "
+        f"{report['uploaded_bytes'] / 1_000_000:.1f} MB"
+    )
+    lines.append(
+        "queue: " + ", ".join(f"{k} {v}" for k, v in report["queue"].items())
+    )
+    return "\n".join(lines)
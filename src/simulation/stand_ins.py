@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class JobLedger:
+    def __init__(self):
+        self.enqueued_at = {}
+        self.dispensed_at = {}
+        self.completed_at = {}
+        self.statuses = {}
+        self._lock = threading.Lock()
+
+    def enqueued(self, video_id):
+        with self._lock:
+            self.enqueued_at[video_id] = time.time()
+
+    def dispensed(self, video_id):
+        with self._lock:
+            self.dispensed_at[video_id] = time.time()
+
+    def completed(self, video_id, status):
+        with self._lock:
+            self.completed_at[video_id] = time.time()
+            self.statuses[video_id] = status
+
+    def all_done(self):
+        with self._lock:
+            return len(self.completed_at) >= len(self.enqueued_at)
+
+
+class FakeSQSClient:
+    def __init__(self, ledger, visibility_timeout, wait_scale):
+        self.ledger = ledger
+        self.visibility_timeout = visibility_timeout
+        self.wait_scale = wait_scale
+        self.messages = {}
+        self.receives = 0
+        self.empty_receives = 0
+        self.redeliveries = 0
+        self.expired_lease_deletes = 0
+        self.stale_deletes = 0
+        self._condition = threading.Condition()
+
+    def send_message(self, QueueUrl, MessageBody):
+        record = json.loads(MessageBody)["Records"][0]
+        video_id = os.path.basename(record["s3"]["object"]["key"])
+        with self._condition:
+            self.messages[str(uuid.uuid4())] = {
+                "body": MessageBody,
+                "video_id": video_id,
+                "visible_at": 0,
+                "receipt_handle": None,
+                "receive_count": 0,
+            }
+            self._condition.notify_all()
+
+    def in_flight(self):
+        with self._condition:
+            return len(self.messages)
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages=1, WaitTimeSeconds=0):
+        deadline = time.time() + WaitTimeSeconds * self.wait_scale
+        with self._condition:
+            while True:
+                now = time.time()
+                received = self._lease_visible(now, MaxNumberOfMessages)
+                if received or now >= deadline:
+                    break
+                self._condition.wait(deadline - now)
+
+            self.receives += 1
+            if not received:
+                self.empty_receives += 1
+                return {}
+            return {"Messages": received}
+
+    def _lease_visible(self, now, limit):
+        received = []
+        for message_id, message in self.messages.items():
+            if len(received) >= limit:
+                break
+            if message["visible_at"] > now:
+                continue
+            message["visible_at"] = now + self.visibility_timeout
+            message["receipt_handle"] = str(uuid.uuid4())
+            message["receive_count"] += 1
+            if message["receive_count"] > 1:
+                self.redeliveries += 1
+            self.ledger.dispensed(message["video_id"])
+            received.append(
+                {
+                    "MessageId": message_id,
+                    "ReceiptHandle": message["receipt_handle"],
+                    "Body": message["body"],
+                }
+            )
+        return received
+
+    def delete_message(self, QueueUrl, ReceiptHandle):
+        with self._condition:
+            for message_id, message in self.messages.items():
+                if message["receipt_handle"] == ReceiptHandle:
+                    if message["visible_at"] < time.time():
+                        self.expired_lease_deletes += 1
+                    del self.messages[message_id]
+                    return {}
+            self.stale_deletes += 1
+            return {}
+
+
+class WebhookServer:
+    def __init__(self, ledger, token):
+        self.ledger = ledger
+        self.token = token
+        self.pending = deque()
+        self.polls = 0
+        self.empty_polls = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_video(self, video_id):
+        with self._lock:
+            self.pending.append(video_id)
+
+    def next_video(self):
+        with self._lock:
+            self.polls += 1
+            if not self.pending:
+                self.empty_polls += 1
+                return None
+            video_id = self.pending.popleft()
+        self.ledger.dispensed(video_id)
+        return video_id
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if self.path.rstrip("/") != "/api/video/getNext":
+                    return self._respond(404, {})
+                video_id = server.next_video()
+                self._respond(200, {"id": video_id} if video_id else {})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                if self.path.rstrip("/") != "/api/video/updateStatus":
+                    return self._respond(404, {})
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                server.ledger.completed(payload["id"], payload["status"])
+                self._respond(200, {})
+
+            def _authorized(self):
+                if self.headers.get("X-Webhook-Token") == server.token:
+                    return True
+                self._respond(401, {})
+                return False
+
+            def _respond(self, code, body):
+                data = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
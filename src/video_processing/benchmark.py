@@ -0,0 +1,73 @@
+import argparse
+import os
+import tempfile
+from src.video_processing import codec_tier
+from src.video_processing.hls_generator import encode_variant, generate_hls_variants
+from src.video_processing.video_info import get_video_info
+
+
+def benchmark_ladder(input_file, output_folder):
+    video_info = get_video_info(input_file)
+    hls_variants = generate_hls_variants(
+        video_info["width"],
+        video_info["height"],
+        os.path.dirname(input_file),
+        video_info["duration"],
+    )
+    hls_variants += codec_tier.generate_codec_tier_variants(hls_variants)
+
+    results = [
+        encode_variant(input_file, output_folder, variant) for variant in hls_variants
+    ]
+
+    h264_sizes = {
+        result["playlist_name"]: result["size_bytes"]
+        for result in results
+        if result["codec"] == "h264"
+    }
+    for result, variant in zip(results, hls_variants):
+        result["kbps"] = (result["average_bandwidth"] or 0) / 1000
+        result["peak_kbps"] = (result["bandwidth"] or 0) / 1000
+        result["size_vs_h264"] = result["size_bytes"] / h264_sizes[variant["rung"]]
+
+    return results
+
+
+def format_results(results):
+    lines = [
+        f"{'rung':<14}{'codec':<7}{'resolution':<12}{'size MB':>10}{'kbps':>9}{'peak':>9}"
+        f"{'vs h264':>9}{'encode s':>10}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result['playlist_name']:<14}{result['codec']:<7}{result['resolution']:<12}"
+            f"{result['size_bytes'] / 1_000_000:>10.1f}{result['kbps']:>9.0f}{result['peak_kbps']:>9.0f}"
+            f"{result['size_vs_h264']:>9.0%}{result['encode_seconds']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Encode the full ladder plus codec tier and report per-rung size and encode time."
+    )
+    parser.add_argument("input_file")
+    parser.add_argument("--codecs", help="comma separated, overrides CODEC_TIER_CODECS")
+    parser.add_argument(
+        "--top-rungs", type=int, help="overrides CODEC_TIER_TOP_RUNGS"
+    )
+    args = parser.parse_args()
+
+    if args.codecs:
+        codec_tier.config.codec_tier_codecs = [
+            codec.strip().lower() for codec in args.codecs.split(",")
+        ]
+    if args.top_rungs is not None:
+        codec_tier.config.codec_tier_top_rungs = args.top_rungs
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        print(format_results(benchmark_ladder(args.input_file, output_folder)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from src.logging_config import logger
+from src.config import load_config
+
+config = load_config()
+
+AAC_CODECS = {"LC": "mp4a.40.2", "HE-AAC": "mp4a.40.5", "HE-AACv2": "mp4a.40.29"}
+
+# HEVC and AV1 need fMP4 segments to play in HLS
+TIER_ENCODERS = {
+    "hevc": {"vcodec": "libx265", "preset": "fast", "crf": 28, "tag:v": "hvc1"},
+    "av1": {"vcodec": "libsvtav1", "preset": 8, "crf": 35},
+}
+
+
+def should_use_codec_tier(duration, expected_views=None):
+    if not config.codec_tier_enabled:
+        return False
+    if (
+        config.codec_tier_min_views
+        and expected_views is not None
+        and expected_views >= config.codec_tier_min_views
+    ):
+        return True
+    return duration >= config.codec_tier_min_duration
+
+
+def generate_codec_tier_variants(hls_variants):
+    tier_variants = []
+    for codec in config.codec_tier_codecs:
+        if codec not in TIER_ENCODERS:
+            logger.warning(f"Unknown codec tier '{codec}', skipping.")
+            continue
+
+        # CRF drives quality, so BANDWIDTH is measured from the segments afterwards
+        for variant in hls_variants[: config.codec_tier_top_rungs]:
+            tier_variants.append(
+                {
+                    **variant,
+                    "playlist_name": f"{variant['rung']}-{codec}",
+                    "codec": codec,
+                }
+            )
+
+    return tier_variants
+
+
+def tier_output_args(codec, variant_folder):
+    return {
+        **TIER_ENCODERS[codec],
+        "hls_segment_type": "fmp4",
+        "hls_fmp4_init_filename": "init.mp4",
+        "hls_segment_filename": f"{variant_folder}/%03d.m4s",
+    }
+
+
+def codecs_attribute(codec_config):
+    # RFC 6381 strings built from the streams actually present in the segment
+    codec_name = codec_config["video_codec"]
+    extradata = codec_config["video_extradata"]
+    if codec_name == "h264":
+        codecs = [_avc_codec_string(extradata)]
+    elif codec_name == "hevc":
+        codecs = [_hevc_codec_string(extradata)]
+    elif codec_name == "av1":
+        codecs = [_av1_codec_string(extradata)]
+    else:
+        raise ValueError(f"Unsupported video codec: {codec_name}")
+
+    if codec_config["audio_codec"]:
+        if codec_config["audio_codec"] != "aac":
+            raise ValueError(f"Unsupported audio codec: {codec_config['audio_codec']}")
+        codecs.append(AAC_CODECS.get(codec_config["audio_profile"], "mp4a.40.2"))
+
+    return ",".join(codecs)
+
+
+def _avc_codec_string(extradata):
+    if extradata[:1] == b"\x01":
+        # avcC: version, profile, constraint flags, level
+        sps = extradata[1:4]
+    else:
+        # Annex B (MPEG-TS): find the SPS NAL unit
+        sps = next(
+            (
+                nal[1:4]
+                for nal in extradata.split(b"\x00\x00\x01")
+                if nal and nal[0] & 0x1F == 7
+            ),
+            b"",
+        )
+    if len(sps) < 3:
+        raise ValueError("No H.264 SPS found")
+    return f"avc1.{sps.hex()}"
+
+
+def _hevc_codec_string(hvcc):
+    if len(hvcc) < 13:
+        raise ValueError("Invalid hvcC record")
+    profile_space = ("", "A", "B", "C")[hvcc[1] >> 6]
+    tier = "H" if hvcc[1] & 0x20 else "L"
+    profile_idc = hvcc[1] & 0x1F
+    compatibility = int(f"{int.from_bytes(hvcc[2:6], 'big'):032b}"[::-1], 2)
+    constraints = hvcc[6:12].rstrip(b"\x00")
+    level = hvcc[12]
+    return (
+        f"hvc1.{profile_space}{profile_idc}.{compatibility:X}.{tier}{level}"
+        + "".join(f".{byte:02X}" for byte in constraints)
+    )
+
+
+def _av1_codec_string(av1c):
+    if len(av1c) < 3:
+        raise ValueError("Invalid av1C record")
+    profile = av1c[1] >> 5
+    level = av1c[1] & 0x1F
+    tier = "H" if av1c[2] & 0x80 else "M"
+    bit_depth = 12 if av1c[2] & 0x20 else 10 if av1c[2] & 0x40 else 8
+    return f"av01.{profile}.{level:02d}{tier}.{bit_depth:02d}"
@@ -1,8 +1,16 @@
 import os
+import shutil
+import time
 import ffmpeg
 from src.logging_config import logger
+from src.video_processing.codec_tier import (
+    codecs_attribute,
+    generate_codec_tier_variants,
+    should_use_codec_tier,
+    tier_output_args,
+)
 from src.video_processing.sprite_generator import generate_sprite_and_vtt
-from src.video_processing.video_info import get_video_info
+from src.video_processing.video_info import get_codec_config, get_video_info
 
 
 def generate_hls_variants(max_width, max_height, folder_path, duration):
@@ -29,6 +37,8 @@ def generate_hls_variants(max_width, max_height, folder_path, duration):
             hls_variants.append(
                 {
                     "playlist_name": variant["name"],
+                    "rung": variant["name"],
+                    "codec": "h264",
                     "resolution": f"{target_width}x{target_height}",
                     "video_bitrate": f"{variant_bitrate}k",
                     "audio_bitrate": (
@@ -40,7 +50,7 @@ def generate_hls_variants(max_width, max_height, folder_path, duration):
     return hls_variants
 
 
-def create_adaptive_hls(input_file, output_folder):
+def create_adaptive_hls(input_file, output_folder, expected_views=None):
     video_info = get_video_info(input_file)
     hls_variants = generate_hls_variants(
         video_info["width"],
@@ -49,27 +59,21 @@ def create_adaptive_hls(input_file, output_folder):
         video_info["duration"],
     )
 
+    tier_variants = []
+    if should_use_codec_tier(video_info["duration"], expected_views):
+        tier_variants = generate_codec_tier_variants(hls_variants)
+
     for variant in hls_variants:
-        playlist_name = variant["playlist_name"]
-        output_stream = f"{output_folder}/{playlist_name}/stream.m3u8"
-        os.makedirs(f"{output_folder}/{playlist_name}", exist_ok=True)
-
-        ffmpeg.input(input_file).output(
-            output_stream,
-            vf=f"scale={variant['resolution']}",
-            vcodec="libx264",
-            preset="veryfast",
-            crf=23,
-            acodec="aac",
-            audio_bitrate=variant["audio_bitrate"],
-            video_bitrate=variant["video_bitrate"],
-            ar="48000",
-            f="hls",
-            hls_time=6,
-            hls_playlist_type="vod",
-            pix_fmt="yuv420p",
-            hls_segment_filename=f"{output_folder}/{playlist_name}/%03d.ts",
-        ).run()
+        variant.update(encode_variant(input_file, output_folder, variant))
+
+    # The tier is optional: a failed HEVC/AV1 encode only drops that rendition
+    for variant in tier_variants:
+        try:
+            variant.update(encode_variant(input_file, output_folder, variant))
+            hls_variants.append(variant)
+        except Exception as e:
+            logger.error(f"Skipping {variant['playlist_name']}, encode failed: {str(e)}")
+            shutil.rmtree(f"{output_folder}/{variant['playlist_name']}", ignore_errors=True)
 
     create_master_playlist(output_folder, hls_variants)
     generate_sprite_and_vtt(input_file, output_folder)
@@ -77,15 +81,100 @@ def create_adaptive_hls(input_file, output_folder):
     return video_info["duration"]
 
 
+def encode_variant(input_file, output_folder, variant):
+    playlist_name = variant["playlist_name"]
+    variant_folder = f"{output_folder}/{playlist_name}"
+    os.makedirs(variant_folder, exist_ok=True)
+
+    if variant["codec"] == "h264":
+        first_segment = f"{variant_folder}/000.ts"
+        codec_args = {
+            "vcodec": "libx264",
+            "preset": "veryfast",
+            "crf": 23,
+            "hls_segment_filename": f"{variant_folder}/%03d.ts",
+        }
+    else:
+        first_segment = f"{variant_folder}/init.mp4"
+        codec_args = tier_output_args(variant["codec"], variant_folder)
+
+    start = time.time()
+    ffmpeg.input(input_file).output(
+        f"{variant_folder}/stream.m3u8",
+        vf=f"scale={variant['resolution']}",
+        acodec="aac",
+        audio_bitrate=variant["audio_bitrate"],
+        video_bitrate=variant["video_bitrate"],
+        ar="48000",
+        f="hls",
+        hls_time=6,
+        hls_playlist_type="vod",
+        pix_fmt="yuv420p",
+        **codec_args,
+    ).run()
+    encode_seconds = time.time() - start
+
+    stats = {
+        "playlist_name": playlist_name,
+        "codec": variant["codec"],
+        "resolution": variant["resolution"],
+        "size_bytes": get_folder_size(variant_folder),
+        "encode_seconds": encode_seconds,
+        "codecs": probe_codecs_attribute(first_segment),
+    }
+    stats["bandwidth"], stats["average_bandwidth"] = measure_bandwidth(variant_folder)
+    logger.info(
+        f"Encoded {playlist_name} ({variant['codec']}): {stats['size_bytes']} bytes in {stats['encode_seconds']:.1f}s"
+    )
+    return stats
+
+
+def measure_bandwidth(variant_folder):
+    # Peak and average segment bitrate in bits/s, read back from the media playlist
+    peak, total_bits, total_seconds = 0, 0, 0.0
+    segment_seconds = None
+    with open(f"{variant_folder}/stream.m3u8") as playlist:
+        for line in playlist:
+            line = line.strip()
+            if line.startswith("#EXTINF:"):
+                segment_seconds = float(line[len("#EXTINF:") :].split(",")[0])
+            elif line and not line.startswith("#") and segment_seconds:
+                bits = os.path.getsize(f"{variant_folder}/{line}") * 8
+                peak = max(peak, bits / segment_seconds)
+                total_bits += bits
+                total_seconds += segment_seconds
+                segment_seconds = None
+
+    if not total_seconds:
+        return None, None
+    return int(peak), int(total_bits / total_seconds)
+
+
+def probe_codecs_attribute(filename):
+    try:
+        return codecs_attribute(get_codec_config(filename))
+    except Exception as e:
+        logger.warning(f"Could not determine CODECS for {filename}: {str(e)}")
+        return None
+
+
 def create_master_playlist(output_folder, hls_variants):
     with open(f"{output_folder}/master.m3u8", "w") as f:
         f.write("#EXTM3U\n")
         for variant in hls_variants:
-            video_bitrate = int(variant["video_bitrate"][:-1]) * 1000
-            audio_bitrate = int(variant["audio_bitrate"][:-1]) * 1000
-            f.write(
-                f"#EXT-X-STREAM-INF:BANDWIDTH={video_bitrate + audio_bitrate},RESOLUTION={variant['resolution']}\n"
-            )
+            if variant.get("bandwidth"):
+                attributes = [
+                    f"BANDWIDTH={variant['bandwidth']}",
+                    f"AVERAGE-BANDWIDTH={variant['average_bandwidth']}",
+                ]
+            else:
+                video_bitrate = int(variant["video_bitrate"][:-1]) * 1000
+                audio_bitrate = int(variant["audio_bitrate"][:-1]) * 1000
+                attributes = [f"BANDWIDTH={video_bitrate + audio_bitrate}"]
+            attributes.append(f"RESOLUTION={variant['resolution']}")
+            if variant.get("codecs"):
+                attributes.append(f'CODECS="{variant["codecs"]}"')
+            f.write(f"#EXT-X-STREAM-INF:{','.join(attributes)}\n")
             f.write(f"{variant['playlist_name']}/stream.m3u8\n")
 
 
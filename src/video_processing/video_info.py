@@ -69,3 +69,46 @@ def get_video_info(filename):
             f"Error getting video info for '{filename}': {str(e)}", exc_info=True
         )
         raise
+
+
+def get_codec_config(filename):
+    # -show_data dumps the codec extradata (avcC/hvcC/av1C or Annex B SPS)
+    cmd = [
+        "ffprobe",
+        "-v",
+        "quiet",
+        "-print_format",
+        "json",
+        "-show_streams",
+        "-show_data",
+        filename,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, cmd, result.stderr)
+
+    streams = json.loads(result.stdout)["streams"]
+    video_stream = next(
+        (stream for stream in streams if stream["codec_type"] == "video"), None
+    )
+    if not video_stream:
+        raise ValueError(f"No video stream found in {filename}")
+    audio_stream = next(
+        (stream for stream in streams if stream["codec_type"] == "audio"), None
+    )
+
+    return {
+        "video_codec": video_stream["codec_name"],
+        "video_extradata": parse_hex_dump(video_stream.get("extradata", "")),
+        "audio_codec": audio_stream["codec_name"] if audio_stream else None,
+        "audio_profile": audio_stream.get("profile") if audio_stream else None,
+    }
+
+
+def parse_hex_dump(dump):
+    # ffprobe lines are "%08x: " followed by a 41 character hex column, then ASCII
+    data = bytearray()
+    for line in dump.strip().splitlines():
+        data += bytes.fromhex(line[10:51].replace(" ", ""))
+    return bytes(data)